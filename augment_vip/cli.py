@@ -2,15 +2,15 @@
 Command-line interface for Augment VIP
 """
 
-import os
 import sys
 import click
-from pathlib import Path
 
 from . import __version__
-from .utils import info, success, error, warning, list_all_vscode_installations
-from .db_cleaner import clean_vscode_db
-from .id_modifier import modify_telemetry_ids
+from .utils import info, success, error, warning, iter_vscode_installations
+
+# The db_cleaner and id_modifier modules drag in sqlite3 and json; they are
+# imported inside the commands that need them so that commands like
+# list-installations don't pay for them at startup.
 
 @click.group()
 @click.version_option(version=__version__)
@@ -21,6 +21,8 @@ def cli():
 @cli.command()
 def clean():
     """Clean VS Code databases by removing Augment-related entries"""
+    from .db_cleaner import clean_vscode_db
+
     if clean_vscode_db():
         success("Database cleaning completed successfully")
     else:
@@ -30,6 +32,8 @@ def clean():
 @cli.command()
 def modify_ids():
     """Modify VS Code telemetry IDs"""
+    from .id_modifier import modify_telemetry_ids
+
     if modify_telemetry_ids():
         success("Telemetry ID modification completed successfully")
     else:
@@ -39,11 +43,14 @@ def modify_ids():
 @cli.command()
 def all():
     """Run all tools (clean and modify IDs)"""
+    from .db_cleaner import clean_vscode_db
+    from .id_modifier import modify_telemetry_ids
+
     info("Running all tools...")
-    
+
     clean_result = clean_vscode_db()
     modify_result = modify_telemetry_ids()
-    
+
     if clean_result and modify_result:
         success("All operations completed successfully")
     else:
@@ -55,7 +62,8 @@ def list_installations():
     """List all detected VS Code installations"""
     info("Scanning for VS Code installations...")
 
-    installations = list_all_vscode_installations()
+    # Materialize once - the count is printed before the details
+    installations = list(iter_vscode_installations())
 
     if not installations:
         warning("No VS Code installations found")
@@ -87,6 +95,11 @@ def install():
 
 def main():
     """Main entry point for the CLI"""
+    # Answer --version without spinning up Click's dispatch machinery
+    if len(sys.argv) == 2 and sys.argv[1] in ("--version", "-V"):
+        print(__version__)
+        return
+
     try:
         cli()
     except Exception as e:
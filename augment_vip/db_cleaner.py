@@ -2,12 +2,8 @@
 VS Code database cleaner module
 """
 
-import os
-import sys
 import sqlite3
 import shutil
-from pathlib import Path
-from typing import List, Dict, Any, Optional
 
 from .utils import info, success, error, warning, get_vscode_paths, backup_file
 
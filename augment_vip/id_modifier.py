@@ -2,11 +2,7 @@
 VS Code telemetry ID modifier module
 """
 
-import os
-import sys
 import json
-from pathlib import Path
-from typing import Dict, Any, Optional
 
 from .utils import (
     info, success, error, warning, 
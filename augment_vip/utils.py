@@ -5,149 +5,259 @@ Utility functions for the Augment VIP project
 import os
 import sys
 import platform
-import json
-import sqlite3
-import uuid
-import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-
-# VS Code installation patterns - each variant can have multiple possible directory structures
-VSCODE_PATTERNS = {
-    "VS Code": [
-        ["Code", "User"],
-    ],
-    "VS Code Insiders": [
-        ["Code - Insiders", "User"],
-    ],
-    "VS Code Server": [
-        [".vscode-server", "data", "User"],  # Standard pattern
-        [".vscode-server", "User"],          # Alternative pattern
-    ],
-    "VS Code Server (Insiders)": [
-        [".vscode-server-insiders", "data", "User"],  # Standard pattern
-        [".vscode-server-insiders", "User"],          # Alternative pattern (likely fix for Linux)
-    ],
-    "VSCodium": [
-        ["VSCodium", "User"],
-    ],
-    "Code-OSS": [
-        ["Code - OSS", "User"],
-    ],
-}
-
-# Console colors
-try:
+from types import MappingProxyType
+from typing import Iterator, List, Dict, Any, Mapping, Optional, Tuple
+
+# The OS cannot change during a process, so resolve it once at import time
+_SYSTEM = platform.system()
+
+# VS Code installation patterns - each variant can have multiple possible directory
+# structures, listed in priority order. Kept as a tuple-of-tuples so the table is
+# immutable and built exactly once at import time.
+VSCODE_PATTERNS = (
+    ("VS Code", (
+        ("Code", "User"),
+    )),
+    ("VS Code Insiders", (
+        ("Code - Insiders", "User"),
+    )),
+    ("VS Code Server", (
+        (".vscode-server", "data", "User"),  # Standard pattern
+        (".vscode-server", "User"),          # Alternative pattern
+    )),
+    ("VS Code Server (Insiders)", (
+        (".vscode-server-insiders", "data", "User"),  # Standard pattern
+        (".vscode-server-insiders", "User"),          # Alternative pattern (likely fix for Linux)
+    )),
+    ("VSCodium", (
+        ("VSCodium", "User"),
+    )),
+    ("Code-OSS", (
+        ("Code - OSS", "User"),
+    )),
+)
+
+# Patterns pre-joined at import time: (first segment, os.sep-joined relative
+# path, display form). The hot loops then build candidates with one string
+# concatenation instead of a Path allocation per segment.
+_VSCODE_PATTERNS_JOINED = tuple(
+    (variant_name, tuple(
+        (pattern[0], os.sep.join(pattern), " / ".join(pattern))
+        for pattern in patterns
+    ))
+    for variant_name, patterns in VSCODE_PATTERNS
+)
+# Console colors - colorama is imported lazily on the first log call so that
+# importing this module doesn't pay for it. The prefixes are built once;
+# each log call is then a single two-argument print.
+_INFO_PREFIX = "[INFO]"
+_SUCCESS_PREFIX = "[SUCCESS]"
+_WARNING_PREFIX = "[WARNING]"
+_ERROR_PREFIX = "[ERROR]"
+_colors_initialized = False
+
+def _init_colors() -> None:
+    """Import colorama on first use and colorize the log prefixes"""
+    global _INFO_PREFIX, _SUCCESS_PREFIX, _WARNING_PREFIX, _ERROR_PREFIX
+    global _colors_initialized
+    _colors_initialized = True
+
+    # find_spec is cheaper than a failed import attempt when colorama is
+    # missing - no ImportError is raised and caught
+    import importlib.util
+    if importlib.util.find_spec("colorama") is None:
+        return  # Fall back to plain prefixes
+
     from colorama import init, Fore, Style
     init()  # Initialize colorama for Windows support
-    
-    def info(msg: str) -> None:
-        """Print an info message in blue"""
-        print(f"{Fore.BLUE}[INFO]{Style.RESET_ALL} {msg}")
-    
-    def success(msg: str) -> None:
-        """Print a success message in green"""
-        print(f"{Fore.GREEN}[SUCCESS]{Style.RESET_ALL} {msg}")
-    
-    def warning(msg: str) -> None:
-        """Print a warning message in yellow"""
-        print(f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL} {msg}")
-    
-    def error(msg: str) -> None:
-        """Print an error message in red"""
-        print(f"{Fore.RED}[ERROR]{Style.RESET_ALL} {msg}")
-        
-except ImportError:
-    # Fallback if colorama is not installed
-    def info(msg: str) -> None:
-        print(f"[INFO] {msg}")
-    
-    def success(msg: str) -> None:
-        print(f"[SUCCESS] {msg}")
-    
-    def warning(msg: str) -> None:
-        print(f"[WARNING] {msg}")
-    
-    def error(msg: str) -> None:
-        print(f"[ERROR] {msg}")
+    _INFO_PREFIX = f"{Fore.BLUE}[INFO]{Style.RESET_ALL}"
+    _SUCCESS_PREFIX = f"{Fore.GREEN}[SUCCESS]{Style.RESET_ALL}"
+    _WARNING_PREFIX = f"{Fore.YELLOW}[WARNING]{Style.RESET_ALL}"
+    _ERROR_PREFIX = f"{Fore.RED}[ERROR]{Style.RESET_ALL}"
+
+def info(msg: str) -> None:
+    """Print an info message in blue"""
+    if not _colors_initialized:
+        _init_colors()
+    print(_INFO_PREFIX, msg)
+
+def success(msg: str) -> None:
+    """Print a success message in green"""
+    if not _colors_initialized:
+        _init_colors()
+    print(_SUCCESS_PREFIX, msg)
+
+def warning(msg: str) -> None:
+    """Print a warning message in yellow"""
+    if not _colors_initialized:
+        _init_colors()
+    print(_WARNING_PREFIX, msg)
 
-def get_base_directories() -> List[Path]:
+def error(msg: str) -> None:
+    """Print an error message in red"""
+    if not _colors_initialized:
+        _init_colors()
+    print(_ERROR_PREFIX, msg)
+
+def _windows_bases() -> List[Optional[str]]:
+    appdata = os.environ.get("APPDATA")
+    userprofile = os.environ.get("USERPROFILE")
+    if not appdata:
+        error("APPDATA environment variable not found")
+        sys.exit(1)
+    return [appdata, userprofile]
+
+def _darwin_bases() -> List[Optional[str]]:
+    home = os.path.expanduser("~")
+    return [os.path.join(home, "Library", "Application Support"), home]
+
+def _linux_bases() -> List[Optional[str]]:
+    home = os.path.expanduser("~")
+    return [os.path.join(home, ".config"), home]
+
+def _unsupported_bases() -> List[Optional[str]]:
+    error(f"Unsupported operating system: {_SYSTEM}")
+    sys.exit(1)
+
+# Resolve the per-OS implementation once at import instead of re-comparing
+# _SYSTEM on every call
+_get_base_dirs_impl = {
+    "Windows": _windows_bases,
+    "Darwin": _darwin_bases,
+    "Linux": _linux_bases,
+}.get(_SYSTEM, _unsupported_bases)
+
+@lru_cache(maxsize=1)
+def get_base_directories() -> Tuple[str, ...]:
     """
-    Get base directories to search for VS Code installations based on OS
+    Get base directories to search for VS Code installations based on OS.
+    The result is cached for the lifetime of the process since neither the
+    OS nor the home directory changes mid-run.
 
     Returns:
-        List of base directory paths
+        Tuple of base directory paths as strings (os.path is markedly
+        cheaper than pathlib in the detection hot loops)
     """
-    system = platform.system()
-    base_dirs = []
+    # Filter out None values
+    return tuple(base_dir for base_dir in _get_base_dirs_impl() if base_dir is not None)
 
-    if system == "Windows":
-        appdata = os.environ.get("APPDATA")
-        userprofile = os.environ.get("USERPROFILE")
-        if not appdata:
-            error("APPDATA environment variable not found")
-            sys.exit(1)
-        base_dirs = [Path(appdata), Path(userprofile) if userprofile else None]
+def _scan_base(base_dir: str) -> set:
+    """
+    List the child names of a base directory with a single scandir call.
 
-    elif system == "Darwin":  # macOS
-        app_support = Path.home() / "Library" / "Application Support"
-        base_dirs = [app_support, Path.home()]
+    Each candidate pattern can then be screened with an O(1) membership test on
+    its first segment instead of a stat syscall per candidate path. All names
+    are kept - symlinked install directories (dotfile managers, cross-drive
+    links) must pass the screen; the leaf stat validates the full path anyway.
 
-    elif system == "Linux":
-        config_dir = Path.home() / ".config"
-        base_dirs = [config_dir, Path.home()]
+    Args:
+        base_dir: Directory to scan
 
-    else:
-        error(f"Unsupported operating system: {system}")
-        sys.exit(1)
+    Returns:
+        Set of child names (empty if the directory is unreadable)
+    """
+    try:
+        with os.scandir(base_dir) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
 
-    # Filter out None values
-    return [base_dir for base_dir in base_dirs if base_dir is not None]
+@lru_cache(maxsize=1)
+def _candidate_table() -> Tuple[Tuple[str, str, str, str, str], ...]:
+    """
+    Flat table of every detection candidate for this OS, built once per
+    process: (variant, first segment, base dir, candidate path, pattern
+    display form), in the pattern table's priority order.
 
-def get_vscode_paths() -> Dict[str, Path]:
+    Both the search loop and the not-found error report walk this table,
+    so neither re-runs the variant x pattern x base-dir product.
+
+    Returns:
+        Tuple of candidate entries
+    """
+    return tuple(
+        (variant_name, first_segment, base_dir, base_dir + os.sep + joined, pattern_used)
+        for variant_name, patterns in _VSCODE_PATTERNS_JOINED
+        for first_segment, joined, pattern_used in patterns
+        for base_dir in get_base_directories()
+    )
+
+def _scan_bases(base_dirs: Tuple[str, ...]) -> Dict[str, set]:
+    """
+    Scan several base directories, in parallel when there is more than one.
+
+    The scans are independent blocking syscalls, so on cold caches (network
+    drives, WSL mount points) threads overlap the I/O. A single directory
+    is scanned inline to skip the pool setup cost.
+
+    Args:
+        base_dirs: Base directories to scan
+
+    Returns:
+        Mapping of base directory to its set of child directory names
+    """
+    if len(base_dirs) <= 1:
+        return {base_dir: _scan_base(base_dir) for base_dir in base_dirs}
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return dict(zip(base_dirs, executor.map(_scan_base, base_dirs)))
+
+@lru_cache(maxsize=1)
+def get_vscode_paths() -> Mapping[str, Any]:
     """
     Get VS Code paths using pattern-based detection.
     Checks multiple patterns for each VS Code variant to handle different directory structures.
 
+    The result is cached for the process lifetime - the filesystem layout
+    does not change mid-run - so commands that clean and modify in one
+    invocation only pay for detection once. The returned mapping is
+    read-only to keep the cached value safe from caller mutation.
+
     Returns:
-        Dict with paths to VS Code directories and files
+        Read-only mapping with paths to VS Code directories and files
     """
     base_dirs = get_base_directories()
 
-    # Try each VS Code variant with multiple patterns in priority order
-    for variant_name, patterns in VSCODE_PATTERNS.items():
-        for pattern in patterns:
-            for base_dir in base_dirs:
-                # Build the full path by joining pattern segments
-                candidate_path = base_dir
-                for segment in pattern:
-                    candidate_path = candidate_path / segment
-
-                # Check if this path exists
-                if candidate_path.exists():
-                    pattern_used = " / ".join(pattern)
-                    info(f"Found {variant_name} installation at: {candidate_path}")
-                    info(f"Using pattern: {pattern_used}")
-
-                    # Return the found installation
-                    return {
-                        "base_dir": candidate_path,
-                        "installation_type": variant_name,
-                        "pattern_used": pattern_used,
-                        "storage_json": candidate_path / "globalStorage" / "storage.json",
-                        "state_db": candidate_path / "globalStorage" / "state.vscdb"
-                    }
+    # One scandir per base directory replaces a stat call per candidate path
+    children_by_base = _scan_bases(base_dirs)
+
+    # Walk the precomputed candidate table in priority order
+    for variant_name, first_segment, base_dir, candidate, pattern_used in _candidate_table():
+        # Only stat the leaf when the first segment is a known child
+        if first_segment not in children_by_base[base_dir]:
+            continue
+
+        # Direct os.stat is cheaper than Path.exists() wrapping it
+        try:
+            os.stat(candidate)
+        except OSError:
+            continue
+
+        info(f"Found {variant_name} installation at: {candidate}")
+        info(f"Using pattern: {pattern_used}")
+
+        # Return the found installation; Path objects are built only
+        # here, for the public fields
+        global_storage = candidate + os.sep + "globalStorage"
+        return MappingProxyType({
+            "base_dir": Path(candidate),
+            "installation_type": variant_name,
+            "pattern_used": pattern_used,
+            "storage_json": Path(global_storage + os.sep + "storage.json"),
+            "state_db": Path(global_storage + os.sep + "state.vscdb")
+        })
 
     # No installation found - show detailed error with all checked patterns
     error("No VS Code installation found. Checked the following patterns:")
-    for variant_name, patterns in VSCODE_PATTERNS.items():
-        error(f"  {variant_name}:")
-        for pattern in patterns:
-            for base_dir in base_dirs:
-                candidate_path = base_dir
-                for segment in pattern:
-                    candidate_path = candidate_path / segment
-                error(f"    - {candidate_path}")
+    last_variant = None
+    for variant_name, _first_segment, _base_dir, candidate, _pattern_used in _candidate_table():
+        if variant_name != last_variant:
+            error(f"  {variant_name}:")
+            last_variant = variant_name
+        error(f"    - {candidate}")
     sys.exit(1)
 
 def backup_file(file_path: Path) -> Path:
@@ -160,10 +270,12 @@ def backup_file(file_path: Path) -> Path:
     Returns:
         Path to the backup file
     """
+    import shutil
+
     if not file_path.exists():
         error(f"File not found: {file_path}")
         sys.exit(1)
-        
+
     backup_path = Path(f"{file_path}.backup")
     shutil.copy2(file_path, backup_path)
     success(f"Created backup at: {backup_path}")
@@ -172,12 +284,61 @@ def backup_file(file_path: Path) -> Path:
 
 def generate_machine_id() -> str:
     """Generate a random 64-character hex string for machineId"""
-    return uuid.uuid4().hex + uuid.uuid4().hex
+    return os.urandom(32).hex()
 
 def generate_device_id() -> str:
     """Generate a random UUID v4 for devDeviceId"""
+    import uuid
     return str(uuid.uuid4())
 
+def iter_vscode_installations() -> Iterator[Dict[str, Any]]:
+    """
+    Yield all available VS Code installations using pattern-based detection.
+
+    Installations are yielded lazily in the pattern table's priority order,
+    so callers that only need the first match can stop without paying for
+    the per-installation globalStorage checks of the rest.
+
+    Yields:
+        Dictionaries containing installation info
+    """
+    base_dirs = get_base_directories()
+
+    # One scandir per base directory replaces a stat call per candidate path.
+    # Walking the candidate table keeps the variant -> pattern -> base-dir
+    # priority order, so this agrees with get_vscode_paths about which path
+    # wins when a variant is present in several places.
+    children_by_base = _scan_bases(base_dirs)
+    matches = {}  # variant name -> (candidate, pattern_used), first hit wins
+    for variant_name, first_segment, base_dir, candidate, pattern_used in _candidate_table():
+        if variant_name in matches:
+            continue
+        if first_segment not in children_by_base[base_dir]:
+            continue
+        if os.path.exists(candidate):
+            matches[variant_name] = (candidate, pattern_used)
+
+    # matches was filled in the table's priority order
+    for variant_name, (candidate, pattern_used) in matches.items():
+        global_storage = candidate + os.sep + "globalStorage"
+
+        # One scandir answers both existence checks
+        try:
+            storage_entries = {entry.name for entry in os.scandir(global_storage)}
+        except OSError:
+            storage_entries = set()
+
+        # Path objects are built only here, for the public fields
+        yield {
+            "name": variant_name,
+            "path": Path(candidate),
+            "pattern_used": pattern_used,
+            "storage_json_exists": "storage.json" in storage_entries,
+            "state_db_exists": "state.vscdb" in storage_entries,
+            "storage_json_path": Path(global_storage + os.sep + "storage.json"),
+            "state_db_path": Path(global_storage + os.sep + "state.vscdb")
+        }
+
 def list_all_vscode_installations() -> List[Dict[str, Any]]:
     """
     List all available VS Code installations using pattern-based detection
@@ -185,36 +346,4 @@ def list_all_vscode_installations() -> List[Dict[str, Any]]:
     Returns:
         List of dictionaries containing installation info
     """
-    base_dirs = get_base_directories()
-    installations = []
-    found_variants = set()  # Track which variants we've already found
-
-    # Check each variant with all patterns
-    for variant_name, patterns in VSCODE_PATTERNS.items():
-        for pattern in patterns:
-            for base_dir in base_dirs:
-                # Build the full path
-                candidate_path = base_dir
-                for segment in pattern:
-                    candidate_path = candidate_path / segment
-
-                # Check if this path exists and we haven't found this variant yet
-                if candidate_path.exists() and variant_name not in found_variants:
-                    storage_json = candidate_path / "globalStorage" / "storage.json"
-                    state_db = candidate_path / "globalStorage" / "state.vscdb"
-                    pattern_used = " / ".join(pattern)
-
-                    installations.append({
-                        "name": variant_name,
-                        "path": candidate_path,
-                        "pattern_used": pattern_used,
-                        "storage_json_exists": storage_json.exists(),
-                        "state_db_exists": state_db.exists(),
-                        "storage_json_path": storage_json,
-                        "state_db_path": state_db
-                    })
-
-                    found_variants.add(variant_name)
-                    break  # Found this variant, don't check other patterns for it
-
-    return installations
+    return list(iter_vscode_installations())